@@ -1,5 +1,8 @@
 import secrets
+import threading
+from collections import namedtuple
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 import models
@@ -7,6 +10,14 @@ import schemas
 from errors import WrongPasswordException
 from utils import hash_password, verify_password, generate_random_short_url
 
+HotUrl = namedtuple('HotUrl', ['id', 'long_url'])
+# short_url -> HotUrl for the most clicked links, filled by the startup warm-up.
+# Per process: with several workers, disabling a link only evicts it in the worker serving the request.
+hot_urls = {}
+hot_urls_lock = threading.Lock()
+# Short urls disabled while a warm-up is running, so it doesn't cache them. None when no warm-up runs.
+evicted_urls = None
+
 
 def validate_user(db: Session, credentials):
     user = get_user_by_email(db, credentials.username)
@@ -47,6 +58,61 @@ def get_url_by_shortened(db: Session, short_url: str):
     return db.query(models.Url).filter(models.Url.short_url == short_url, models.Url.is_active == True).first()
 
 
+def get_redirect_target(db: Session, short_url: str):
+    """
+    Returns the preloaded hot link if any, else falls back to the DB lookup.
+    Both paths return a HotUrl (id, long_url) or None: add fields to HotUrl
+    and to the warm-up query before relying on anything else in the redirect.
+    """
+    hot = hot_urls.get(short_url)
+    if hot is not None:
+        return hot
+    url = get_url_by_shortened(db, short_url)
+    if url is None:
+        return None
+    return HotUrl(url.id, url.long_url)
+
+
+def start_tracking_evictions():
+    global evicted_urls
+    with hot_urls_lock:
+        evicted_urls = set()
+
+
+def stop_tracking_evictions():
+    global evicted_urls
+    with hot_urls_lock:
+        evicted_urls = None
+
+
+def cache_hot_urls(hot: dict):
+    """Adds the warm-up results to the redirect cache, minus the urls disabled meanwhile."""
+    with hot_urls_lock:
+        for short_url in evicted_urls or ():
+            hot.pop(short_url, None)
+        hot_urls.update(hot)
+    return len(hot)
+
+
+def evict_hot_url(short_url: str):
+    with hot_urls_lock:
+        hot_urls.pop(short_url, None)
+        if evicted_urls is not None:
+            evicted_urls.add(short_url)
+
+
+def get_most_clicked_urls(db: Session, limit: int = 100):
+    return (
+        db.query(models.Url.id, models.Url.short_url, models.Url.long_url)
+        .join(models.Click, models.Click.link_id == models.Url.id)
+        .filter(models.Url.is_active == True)
+        .group_by(models.Url.id)
+        .order_by(func.count(models.Click.id).desc())
+        .limit(limit)
+        .all()
+    )
+
+
 def create_user_url(db: Session, url: schemas.UrlCreate, user_id: int):
     if url.short_url is None:
         url.short_url = generate_random_short_url()
@@ -78,6 +144,8 @@ def disable_url(db: Session, url_id: int):
         raise ValueError("Url not found")
     url.is_active = False
     db.commit()
+    # After the commit: a warm-up reading the row as active has it recorded as evicted.
+    evict_hot_url(url.short_url)
     db.refresh(url)
     return url
 
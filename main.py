@@ -1,26 +1,31 @@
 """
 Run server from console with:
 uvicorn main:app --reload
+Readiness (after startup warm-up): GET /healthz/ready
 """
 from datetime import datetime
 from typing import List
 
 from fastapi import Depends, FastAPI, HTTPException, Request, status
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
 from sqlalchemy.orm import Session
 
 import crud
-import models
 import schemas
+import warmup
 from database import SessionLocal, engine
 from errors import WrongPasswordException
 
-models.Base.metadata.create_all(bind=engine)
 app = FastAPI(title="URL shortener")
 
 
+@app.on_event("startup")
+def startup():
+    warmup.start(engine, SessionLocal)
+
+
 # Dependencies
 def get_db():
     db = SessionLocal()
@@ -50,9 +55,16 @@ async def read_main():
     return {"msg": "URL shortener"}
 
 
+@app.get("/healthz/ready")
+def readiness():
+    if not warmup.ready.is_set():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "warming up"})
+    return {"status": "ready"}
+
+
 @app.get("/{short_url}")
 def access_url(short_url: str, request: Request, db: Session = Depends(get_db)):
-    url = crud.get_url_by_shortened(db, short_url)
+    url = crud.get_redirect_target(db, short_url)
     if url is None:
         raise HTTPException(status_code=404, detail="That link doesn't exist.")
     headers = request.headers
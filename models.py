@@ -36,7 +36,7 @@ class Click(Base):
     __tablename__ = "clicks"
 
     id = Column(Integer, primary_key=True, index=True)
-    link_id = Column(Integer, ForeignKey("urls.id"))
+    link_id = Column(Integer, ForeignKey("urls.id"), index=True)
     visited = Column(DateTime, index=True)
     referer = Column(String, index=True)
     user_agent = Column(String, index=True)
@@ -0,0 +1,159 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+import crud
+import models
+import schemas
+import warmup
+from database import SCHEMA_VERSION
+from main import app
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warmup.db'}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+    crud.hot_urls.clear()
+    crud.stop_tracking_evictions()
+    warmup.ready.clear()
+
+
+@pytest.fixture
+def db(engine):
+    warmup.ensure_schema(engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield db
+    db.close()
+
+
+def add_url_with_clicks(db, short_url, clicks, is_active=True):
+    url = models.Url(short_url=short_url, long_url=f"http://{short_url}.org", is_active=is_active)
+    db.add(url)
+    db.commit()
+    db.add_all([models.Click(link_id=url.id) for _ in range(clicks)])
+    db.commit()
+    return url
+
+
+def test_ensure_schema_skips_when_version_matches(engine):
+    assert warmup.ensure_schema(engine) is True
+    assert engine.execute("PRAGMA user_version").scalar() == SCHEMA_VERSION
+    assert warmup.ensure_schema(engine) is False
+
+
+def test_preload_hot_urls_keeps_top_n_active(db):
+    add_url_with_clicks(db, "cold", 1)
+    add_url_with_clicks(db, "hot", 3)
+    add_url_with_clicks(db, "warm", 2)
+    add_url_with_clicks(db, "off", 5, is_active=False)
+
+    assert warmup.preload_hot_urls(db, limit=2) == 2
+    assert set(crud.hot_urls) == {"hot", "warm"}
+    assert crud.get_redirect_target(db, "hot").long_url == "http://hot.org"
+
+
+def test_disable_url_evicts_hot_url(db):
+    url = add_url_with_clicks(db, "hot", 1)
+    warmup.preload_hot_urls(db)
+    crud.disable_url(db, url.id)
+    assert crud.get_redirect_target(db, "hot") is None
+
+
+def test_warm_pages_stops_at_deadline(engine):
+    warmup.ensure_schema(engine)
+    assert warmup.warm_pages(engine.url.database, deadline=time.monotonic() - 1) == 0
+    assert warmup.warm_pages(engine.url.database, deadline=time.monotonic() + 10) > 0
+
+
+def test_readiness_only_after_warm_up(db, engine):
+    client = TestClient(app)
+    warmup.ready.clear()
+    response = client.get("/healthz/ready")
+    assert response.status_code == 503
+
+    warmup.warm_up(sessionmaker(bind=engine), engine.url.database, budget=1)
+    response = client.get("/healthz/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+def test_slow_preload_is_aborted_within_budget(db, engine, monkeypatch):
+    def slow_query(db, limit):
+        return db.execute(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n"
+        ).fetchall()
+
+    monkeypatch.setattr(crud, "get_most_clicked_urls", slow_query)
+    warmup.ready.clear()
+    started = time.monotonic()
+    warmup.warm_up(sessionmaker(bind=engine), engine.url.database, budget=0.2)
+    assert time.monotonic() - started < 2
+    assert warmup.ready.is_set()
+    assert crud.hot_urls == {}
+
+
+def test_url_disabled_during_preload_is_not_cached(db, monkeypatch):
+    url = add_url_with_clicks(db, "hot", 1)
+    read_while_active = crud.get_most_clicked_urls(db, limit=10)
+    monkeypatch.setattr(crud, "get_most_clicked_urls", lambda db, limit: read_while_active)
+
+    crud.start_tracking_evictions()
+    crud.disable_url(db, url.id)
+    warmup.preload_hot_urls(db)
+    crud.stop_tracking_evictions()
+    assert crud.get_redirect_target(db, "hot") is None
+
+
+def test_redirect_target_has_same_shape_on_hit_and_miss(db):
+    add_url_with_clicks(db, "hot", 1)
+    miss = crud.get_redirect_target(db, "hot")
+    warmup.preload_hot_urls(db)
+    assert crud.get_redirect_target(db, "hot") == miss
+    assert isinstance(miss, crud.HotUrl)
+
+
+def test_ensure_schema_adds_index_to_existing_tables(engine):
+    warmup.ensure_schema(engine)
+    engine.execute("DROP INDEX ix_clicks_link_id")
+    engine.execute("PRAGMA user_version = 1")
+    assert warmup.ensure_schema(engine) is True
+    assert "ix_clicks_link_id" in {index["name"] for index in inspect(engine).get_indexes("clicks")}
+
+
+def test_click_write_succeeds_during_slow_preload(db, engine, monkeypatch):
+    add_url_with_clicks(db, "hot", 1)
+
+    def slow_query(db, limit):
+        return db.execute(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n, clicks"
+        ).fetchall()
+
+    monkeypatch.setattr(crud, "get_most_clicked_urls", slow_query)
+    preload = threading.Thread(target=warmup.warm_up, args=(sessionmaker(bind=engine), engine.url.database))
+    preload.start()
+    time.sleep(0.2)
+
+    # Short busy timeout: with a rollback journal this would fail with "database is locked".
+    writer = create_engine(engine.url, connect_args={"check_same_thread": False, "timeout": 0.1})
+    writer_db = sessionmaker(bind=writer)()
+    try:
+        click = schemas.ClickCreate(visited=datetime.now())
+        assert crud.create_url_click(writer_db, click=click, url_id=1).id is not None
+    finally:
+        writer_db.close()
+        writer.dispose()
+    preload.join()
+    assert warmup.ready.is_set()
+
+
+def test_start_tracks_evictions_before_serving(engine, monkeypatch):
+    monkeypatch.setattr(warmup, "warm_up", lambda *args, **kwargs: None)
+    warmup.start(engine, sessionmaker(bind=engine)).join()
+    assert crud.evicted_urls == set()
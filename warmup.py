@@ -0,0 +1,121 @@
+"""
+Startup phase: schema check, then a time boxed warm-up (hot links and SQLite pages).
+The app reports ready on /healthz/ready only after the warm-up is done.
+See crud.hot_urls for the single process assumption of the hot links cache.
+"""
+import logging
+import threading
+import time
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+
+import crud
+import models
+from database import SCHEMA_VERSION
+
+WARMUP_TOP_N = 1000
+WARMUP_BUDGET_SECONDS = 30.0
+# Kept below the 5s SQLite busy timeout: if WAL is unavailable, the preload read lock can't starve click writes.
+PRELOAD_BUDGET_SECONDS = 2.0
+PAGE_CHUNK_BYTES = 1024 * 1024
+# SQLite VM instructions between deadline checks while preloading.
+PROGRESS_OPCODES = 10000
+
+logger = logging.getLogger(__name__)
+ready = threading.Event()
+
+
+def ensure_schema(engine):
+    """
+    Switches the database to WAL, so warm-up reads don't block click writes.
+    Then creates the missing tables and indexes only if the stored schema version doesn't match.
+
+    Returns:
+    --------
+    Bool
+        True if the schema was (re)created, False if it was skipped.
+    """
+    with engine.connect() as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        if conn.execute("PRAGMA user_version").scalar() == SCHEMA_VERSION:
+            return False
+        models.Base.metadata.create_all(bind=conn)
+        # create_all skips existing tables, including indexes added to them later.
+        inspector = inspect(conn)
+        for table in models.Base.metadata.sorted_tables:
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=conn)
+        conn.execution_options(autocommit=True).execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return True
+
+
+def preload_hot_urls(db, limit: int = WARMUP_TOP_N, deadline: float = None):
+    """
+    Loads the most clicked active links into the redirect cache. Returns how many.
+    With a deadline, SQLite aborts the query once it passes (raises OperationalError).
+    """
+    raw_connection = db.connection().connection
+    if deadline is not None:
+        raw_connection.set_progress_handler(lambda: time.monotonic() > deadline, PROGRESS_OPCODES)
+    try:
+        rows = crud.get_most_clicked_urls(db, limit=limit)
+    finally:
+        raw_connection.set_progress_handler(None, 0)
+    return crud.cache_hot_urls({row.short_url: crud.HotUrl(row.id, row.long_url) for row in rows})
+
+
+def warm_pages(db_path: str, deadline: float):
+    """Reads the database file sequentially into the OS page cache until done or past the deadline."""
+    read = 0
+    with open(db_path, 'rb') as db_file:
+        while time.monotonic() < deadline:
+            chunk = db_file.read(PAGE_CHUNK_BYTES)
+            if not chunk:
+                break
+            read += len(chunk)
+    return read
+
+
+def warm_up(session_factory, db_path: str, top_n: int = WARMUP_TOP_N, budget: float = WARMUP_BUDGET_SECONDS):
+    """
+    Runs the warm-up steps within the time budget and flags the app as ready.
+    A step running when the budget runs out is aborted and the rest are skipped:
+    warm-up is best effort, readiness is not.
+    """
+    deadline = time.monotonic() + budget
+    preload_deadline = min(deadline, time.monotonic() + PRELOAD_BUDGET_SECONDS)
+    try:
+        db = session_factory()
+        try:
+            logger.info("Preloaded %s hot links", preload_hot_urls(db, limit=top_n, deadline=preload_deadline))
+        except OperationalError:
+            if time.monotonic() <= preload_deadline:
+                raise
+            logger.warning("Preload budget exhausted, aborted hot links preload")
+        finally:
+            db.close()
+            crud.stop_tracking_evictions()
+        if time.monotonic() < deadline:
+            logger.info("Warmed %s bytes of SQLite pages", warm_pages(db_path, deadline))
+        else:
+            logger.warning("Warm-up budget exhausted, skipping page warming")
+    except Exception:
+        logger.exception("Warm-up failed, serving cold")
+    finally:
+        ready.set()
+
+
+def start(engine, session_factory, **kwargs):
+    """Checks the schema before serving, then warms up in the background."""
+    ready.clear()
+    ensure_schema(engine)
+    # Before serving, so no DELETE can slip in between tracking and the preload read.
+    crud.start_tracking_evictions()
+    thread = threading.Thread(
+        target=warm_up, args=(session_factory, engine.url.database), kwargs=kwargs, name="warm-up", daemon=True
+    )
+    thread.start()
+    return thread